@@ -1,15 +1,36 @@
 import chess
-import chess.svg
+import multiprocessing
+import os
 import sys
+from xml.etree import ElementTree
 from PyQt5.QtCore import Qt, QTimer, QMimeData
-from PyQt5.QtGui import QDrag, QPixmap, QPainter
-from PyQt5.QtSvg import QSvgWidget, QSvgRenderer
+from PyQt5.QtGui import QDrag, QPixmap, QPixmapCache, QPainter
+from PyQt5.QtSvg import QSvgRenderer
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QComboBox, QGridLayout,
                             QFrame, QSplitter, QToolBar)
-import time
 import io
 
+from points_app import EngineSearchMixin
+from points_engine import PointsChessEngine
+
+# Shared by all SVG rendering, created on first use
+_svg_renderer = None
+
+def _render_svg(svg, width, height):
+    """Render an SVG string into a transparent width x height pixmap"""
+    global _svg_renderer
+    if _svg_renderer is None:
+        _svg_renderer = QSvgRenderer()
+    _svg_renderer.load(svg.encode('UTF-8'))
+    
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    _svg_renderer.render(painter)
+    painter.end()
+    return pixmap
+
 class ChessPieceWidget(QLabel):
     def __init__(self, piece_type, piece_color, parent=None):
         super().__init__(parent)
@@ -32,27 +53,32 @@ class ChessPieceWidget(QLabel):
             (chess.KING, chess.BLACK): "black-king",
         }
         
-        # Create piece SVG
-        piece_svg = chess.svg.piece(chess.Piece(piece_type, piece_color))
-        
-        # Convert SVG to pixmap
-        renderer = QSvgRenderer()
-        renderer.load(bytes(piece_svg, 'utf-8'))
-        pixmap = QPixmap(50, 50)
-        pixmap.fill(Qt.transparent)
-        
-        # Use QPainter to paint on the pixmap
-        painter = QPainter(pixmap)
-        renderer.render(painter)
-        painter.end()
-        
         # Set pixmap to label
-        self.setPixmap(pixmap)
+        self.setPixmap(self.piece_pixmap(piece_type, piece_color))
         self.setFixedSize(50, 50)
         
         # Enable dragging
         self.setAcceptDrops(False)
         
+    @classmethod
+    def piece_pixmap(cls, piece_type, piece_color, size=50):
+        """Get the pixmap for a piece, rendering it only on a cache miss"""
+        key = f"piece_{piece_type}_{int(piece_color)}_{size}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = cls.render_piece(piece_type, piece_color, size)
+            QPixmapCache.insert(key, pixmap)
+        return pixmap
+        
+    @staticmethod
+    def render_piece(piece_type, piece_color, size=50):
+        """Render the SVG for a piece into a size x size pixmap"""
+        import chess.svg
+        
+        # Create piece SVG and convert it to a pixmap
+        piece_svg = chess.svg.piece(chess.Piece(piece_type, piece_color))
+        return _render_svg(piece_svg, size, size)
+        
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.drag_start_position = event.pos()
@@ -63,7 +89,7 @@ class ChessPieceWidget(QLabel):
             
         # Start drag operation
         mime_data = QMimeData()
-        mime_data.setText(f"{self.piece_type},{self.piece_color}")
+        mime_data.setText(f"{self.piece_type},{int(self.piece_color)}")
         
         drag = QDrag(self)
         drag.setMimeData(mime_data)
@@ -72,43 +98,80 @@ class ChessPieceWidget(QLabel):
         
         drag.exec_(Qt.CopyAction)
 
+def _prime_piece_cache():
+    """Render all 12 piece pixmaps into QPixmapCache once at startup"""
+    for piece_color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            ChessPieceWidget.piece_pixmap(piece_type, piece_color)
+            ChessPieceWidget.piece_pixmap(piece_type, piece_color, ChessBoardWidget.SQUARE_PX)
+
 class ChessBoardWidget(QWidget):
+    # Size of one board square in pixels
+    SQUARE_PX = 75
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.board = chess.Board(chess.STARTING_FEN)
         self.board.clear()  # Start with empty board for manual setup
         
-        # Create SVG widget to display the board
-        self.svg_widget = QSvgWidget()
-        self.svg_widget.setGeometry(0, 0, 600, 600)
+        # Render the empty board with its coordinate margin once; redraws
+        # only paint the pieces on top of a copy of it
+        self._board_background, self._margin_px = self.render_background(self.SQUARE_PX)
+        
+        # Create label widget to display the board
+        self.board_label = QLabel()
+        self.board_label.setFixedSize(self._board_background.size())
         
         # Initialize the layout
         layout = QVBoxLayout()
-        layout.addWidget(self.svg_widget)
+        layout.addWidget(self.board_label)
         self.setLayout(layout)
         
         # Connect mouse events for piece movement
         self.selected_square = None
-        self.svg_widget.mousePressEvent = self.mouse_press_event
-        self.svg_widget.mouseMoveEvent = self.mouse_move_event
+        self.board_label.mousePressEvent = self.mouse_press_event
+        self.board_label.mouseMoveEvent = self.mouse_move_event
         
         # Setup drag and drop
-        self.svg_widget.setAcceptDrops(True)
-        self.svg_widget.dragEnterEvent = self.drag_enter_event
-        self.svg_widget.dropEvent = self.drop_event
+        self.board_label.setAcceptDrops(True)
+        self.board_label.dragEnterEvent = self.drag_enter_event
+        self.board_label.dropEvent = self.drop_event
         
         # Update the board display
         self.update_board()
         
+    @staticmethod
+    def render_background(square_px):
+        """Render the empty board, returns the pixmap and its margin in pixels"""
+        import chess.svg
+        
+        board_svg = chess.svg.board(None)
+        
+        # Scale the SVG so that its squares come out square_px wide
+        full_size = float(ElementTree.fromstring(board_svg).get("viewBox").split()[2])
+        scale = square_px / chess.svg.SQUARE_SIZE
+        board_px = round(full_size * scale)
+        margin_px = round((full_size - 8 * chess.svg.SQUARE_SIZE) / 2 * scale)
+        
+        return _render_svg(board_svg, board_px, board_px), margin_px
+        
     def update_board(self):
         """Update the board display"""
-        svg_data = chess.svg.board(self.board, size=600).encode('UTF-8')
-        self.svg_widget.load(svg_data)
+        pixmap = QPixmap(self._board_background)
+        painter = QPainter(pixmap)
+        for square, piece in self.board.piece_map().items():
+            x = self._margin_px + chess.square_file(square) * self.SQUARE_PX
+            y = self._margin_px + (7 - chess.square_rank(square)) * self.SQUARE_PX
+            painter.drawPixmap(x, y, ChessPieceWidget.piece_pixmap(piece.piece_type, piece.color,
+                                                                   self.SQUARE_PX))
+        painter.end()
+        self.board_label.setPixmap(pixmap)
         
     def get_square_at_position(self, pos):
         """Get chess square at mouse position"""
-        x = pos.x() * 8 // self.svg_widget.width()
-        y = (self.svg_widget.height() - pos.y()) * 8 // self.svg_widget.height()
+        # Locate the 8x8 area inside the coordinate margin
+        x = (pos.x() - self._margin_px) // self.SQUARE_PX
+        y = 7 - (pos.y() - self._margin_px) // self.SQUARE_PX
         
         # Validate coordinates (ensure they're within the board)
         if x < 0 or x > 7 or y < 0 or y > 7:
@@ -124,6 +187,9 @@ class ChessBoardWidget(QWidget):
         if square is None:
             return
             
+        # Only a change of position needs a redraw; the selection isn't drawn
+        dirty = False
+        
         # If a square is already selected, try to make a move
         if self.selected_square is not None:
             # Create a move from the selected square to the clicked square
@@ -132,14 +198,15 @@ class ChessBoardWidget(QWidget):
             # Check if the move is legal
             if move in self.board.legal_moves:
                 self.board.push(move)
-                self.update_board()
+                dirty = True
             self.selected_square = None
-            self.update_board()
         else:
             # If the clicked square has a piece, select it
             if self.board.piece_at(square) is not None:
                 self.selected_square = square
-                self.update_board()
+                
+        if dirty:
+            self.update_board()
                 
     def mouse_move_event(self, event):
         """Handle mouse move events for piece dragging"""
@@ -261,144 +328,31 @@ class PieceSetupPanel(QWidget):
         # the piece wasn't placed on the board
         event.acceptProposedAction()
 
-class PointsChessEngine:
-    def __init__(self):
-        # Point values for each piece type
-        self.piece_values = {
-            chess.PAWN: 1,
-            chess.KNIGHT: 3,
-            chess.BISHOP: 3,
-            chess.ROOK: 5,
-            chess.QUEEN: 9,
-            chess.KING: 0  # King has no capture value
-        }
-        
-        # Track points for each player
-        self.white_points = 0
-        self.black_points = 0
-        
-        # Track moves made
-        self.moves_made = 0
-        self.max_moves = 6  # 6 moves per player
-        
-        # Track if extra move is granted
-        self.extra_move_granted = False
-        
-    def reset(self):
-        """Reset the engine state for a new game"""
-        self.white_points = 0
-        self.black_points = 0
-        self.moves_made = 0
-        self.extra_move_granted = False
-        
-    def evaluate_position(self, board):
-        """Evaluate the current position based on points captured"""
-        score = self.white_points - self.black_points
-        
-        # Check if checkmate is possible
-        if board.is_checkmate():
-            # If white is checkmated, return very negative score
-            # If black is checkmated, return very positive score
-            return -10000 if board.turn == chess.WHITE else 10000
-            
-        return score
+class PointsChessApp(EngineSearchMixin, QMainWindow):
+    # Deepest search to try, and the time it may take in seconds
+    SEARCH_DEPTH = 6
+    SEARCH_TIME_LIMIT = 2.0
     
-    def is_piece_supported(self, board, move):
-        """Check if the piece being captured is supported by any other piece"""
-        if not board.is_capture(move):
-            return False
-            
-        to_square = move.to_square
-        capturing_piece = board.piece_at(move.from_square)
-        
-        # Get the color of the piece being captured
-        captured_color = not board.turn
-        
-        # Check if any piece of the captured color attacks the square
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.color == captured_color:
-                if to_square in board.attacks(square):
-                    return True
-        
-        return False
+    # Fewest CPUs for which searching the root in parallel pays off
+    SEARCH_POOL_MIN_CPUS = 4
     
-    def calculate_best_move(self, board, depth=3, is_last_move=False):
-        """Find the best move considering points chess rules"""
-        best_score = float('-inf') if board.turn == chess.WHITE else float('inf')
-        best_move = None
-        
-        legal_moves = list(board.legal_moves)
-        
-        # Sort moves to check captures first (optimization)
-        legal_moves.sort(key=lambda move: board.is_capture(move), reverse=True)
-        
-        for move in legal_moves:
-            # Make the move
-            captured_piece = board.piece_at(move.to_square)
-            board.push(move)
-            
-            # Calculate score after move
-            if captured_piece:
-                capture_value = self.piece_values[captured_piece.piece_type]
-                if board.turn == chess.BLACK:  # White captured
-                    self.white_points += capture_value
-                else:  # Black captured
-                    self.black_points += capture_value
-            
-            # Check for checkmate (immediate win)
-            if board.is_checkmate():
-                score = 10000 if board.turn == chess.BLACK else -10000
-            # If last move and supported piece was captured, need to consider opponent's extra move
-            elif is_last_move and captured_piece and self.is_piece_supported(board, move):
-                # Opponent gets extra move, so evaluate after that move
-                extra_move = self.calculate_best_move(board, depth-1, False)
-                if extra_move:
-                    # Opponent will make their best move, so use that evaluation
-                    score = self.evaluate_position(board)
-                else:
-                    score = self.evaluate_position(board)
-            elif depth > 1:
-                # Regular minimax recursion
-                next_move = self.calculate_best_move(board, depth-1, False)
-                score = self.evaluate_position(board)
-            else:
-                score = self.evaluate_position(board)
-            
-            # Undo the move and point calculation
-            if captured_piece:
-                capture_value = self.piece_values[captured_piece.piece_type]
-                if board.turn == chess.WHITE:  # Black captured
-                    self.black_points -= capture_value
-                else:  # White captured
-                    self.white_points -= capture_value
-            board.pop()
-            
-            # Update best move
-            if board.turn == chess.WHITE:
-                if score > best_score:
-                    best_score = score
-                    best_move = move
-            else:
-                if score < best_score:
-                    best_score = score
-                    best_move = move
-        
-        return best_move
-
-class PointsChessApp(QMainWindow):
     def __init__(self):
         super().__init__()
         
         # Set up the main window
         self.setWindowTitle("Points Chess Assistant")
-        self.setGeometry(100, 100, 900, 700)
+        self.setGeometry(100, 100, 1000, 720)
         
         # Create the chess board
         self.chess_board = ChessBoardWidget()
         
-        # Create the engine
+        # Create the engine, and on machines with enough cores worker
+        # processes that share its root search. Spawned rather than forked,
+        # since forking a running Qt app is unsafe.
         self.engine = PointsChessEngine()
+        self.search_pool = None
+        if (os.cpu_count() or 1) >= self.SEARCH_POOL_MIN_CPUS:
+            self.search_pool = multiprocessing.get_context("spawn").Pool()
         
         # Create the control panel
         self.control_panel = QWidget()
@@ -457,9 +411,10 @@ class PointsChessApp(QMainWindow):
         self.status_frame.setLayout(status_layout)
         control_layout.addWidget(self.status_frame)
         
-        # Piece setup panel
-        self.setup_panel = PieceSetupPanel(self.chess_board)
-        control_layout.addWidget(self.setup_panel)
+        # Piece setup panel, built once the window is up (see build_setup_panel)
+        self.setup_panel = None
+        self.control_layout = control_layout
+        QTimer.singleShot(0, self.build_setup_panel)
         
         # Set control panel layout
         self.control_panel.setLayout(control_layout)
@@ -468,7 +423,7 @@ class PointsChessApp(QMainWindow):
         splitter = QSplitter(Qt.Horizontal)
         splitter.addWidget(self.chess_board)
         splitter.addWidget(self.control_panel)
-        splitter.setSizes([600, 300])
+        splitter.setSizes([680, 320])
         
         # Set the central widget
         self.setCentralWidget(splitter)
@@ -476,6 +431,14 @@ class PointsChessApp(QMainWindow):
         # Game state
         self.game_active = False
 
+    def build_setup_panel(self):
+        """Add the piece setup panel after the window's first paint"""
+        self.setup_panel = PieceSetupPanel(self.chess_board)
+        self.control_layout.addWidget(self.setup_panel)
+        
+        # Render the remaining piece sizes before pieces are placed
+        _prime_piece_cache()
+        
     def set_starting_player(self, color):
         """Set which player goes first"""
         if not self.game_active:
@@ -484,58 +447,15 @@ class PointsChessApp(QMainWindow):
             self.engine.reset()
             self.update_status()
             
-    def calculate_best_move(self):
-        """Calculate and show the best move"""
-        if not self.game_active:
-            return
-            
-        # Update status
-        self.engine_status.setText("Engine: Calculating...")
-        QApplication.processEvents()
+    def closeEvent(self, event):
+        """Shut down the search and its worker processes with the window"""
+        # The search has to return before the pool goes away, or it would
+        # keep waiting for results from the terminated workers
+        self.stop_search()
+        if self.search_pool is not None:
+            self.search_pool.terminate()
+        super().closeEvent(event)
         
-        # Determine if this is the last move
-        is_last_move = self.engine.moves_made >= 5
-        
-        # Calculate best move
-        start_time = time.time()
-        move = self.engine.calculate_best_move(self.chess_board.board, depth=4, is_last_move=is_last_move)
-        end_time = time.time()
-        
-        if move:
-            # Get the piece type at the destination square (for capture calculation)
-            captured_piece = self.chess_board.board.piece_at(move.to_square)
-            
-            # Make the move
-            self.chess_board.board.push(move)
-            
-            # Update points if a capture was made
-            if captured_piece:
-                capture_value = self.engine.piece_values[captured_piece.piece_type]
-                if self.chess_board.board.turn == chess.BLACK:  # White captured
-                    self.engine.white_points += capture_value
-                else:  # Black captured
-                    self.engine.black_points += capture_value
-                    
-                # Check for extra move on last turn
-                if is_last_move and self.engine.is_piece_supported(self.chess_board.board, move):
-                    self.engine.extra_move_granted = True
-            
-            # Update moves counter
-            self.engine.moves_made += 1
-            
-            # Update display
-            self.chess_board.update_board()
-            self.update_status()
-            
-            # Show calculation time
-            calc_time = end_time - start_time
-            self.engine_status.setText(f"Engine: Move found in {calc_time:.2f} seconds")
-            
-            # Check for game end
-            self.check_game_end()
-        else:
-            self.engine_status.setText("Engine: No legal moves found")
-            
     def skip_turn(self):
         """Skip the current player's turn"""
         if not self.game_active:
@@ -1,139 +1,40 @@
 import chess
 import chess.svg
 import sys
+from collections import OrderedDict
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtSvg import QSvgWidget
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QComboBox, QGridLayout,
                             QFrame, QSplitter)
-import time
 
-class PointsChessEngine:
-    def __init__(self):
-        # Point values for each piece type
-        self.piece_values = {
-            chess.PAWN: 1,
-            chess.KNIGHT: 3,
-            chess.BISHOP: 3,
-            chess.ROOK: 5,
-            chess.QUEEN: 9,
-            chess.KING: 0  # King has no capture value
-        }
-        
-        # Track points for each player
-        self.white_points = 0
-        self.black_points = 0
-        
-        # Track moves made
-        self.moves_made = 0
-        self.max_moves = 6  # 6 moves per player
-        
-        # Track if extra move is granted
-        self.extra_move_granted = False
-        
-    def reset(self):
-        """Reset the engine state for a new game"""
-        self.white_points = 0
-        self.black_points = 0
-        self.moves_made = 0
-        self.extra_move_granted = False
-        
-    def evaluate_position(self, board):
-        """Evaluate the current position based on points captured"""
-        score = self.white_points - self.black_points
-        
-        # Check if checkmate is possible
-        if board.is_checkmate():
-            # If white is checkmated, return very negative score
-            # If black is checkmated, return very positive score
-            return -10000 if board.turn == chess.WHITE else 10000
-            
-        return score
-    
-    def is_piece_supported(self, board, move):
-        """Check if the piece being captured is supported by any other piece"""
-        if not board.is_capture(move):
-            return False
-            
-        to_square = move.to_square
-        capturing_piece = board.piece_at(move.from_square)
-        
-        # Get the color of the piece being captured
-        captured_color = not board.turn
-        
-        # Check if any piece of the captured color attacks the square
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece and piece.color == captured_color:
-                if to_square in board.attacks(square):
-                    return True
-        
-        return False
-    
-    def calculate_best_move(self, board, depth=3, is_last_move=False):
-        """Find the best move considering points chess rules"""
-        best_score = float('-inf') if board.turn == chess.WHITE else float('inf')
-        best_move = None
-        
-        legal_moves = list(board.legal_moves)
-        
-        # Sort moves to check captures first (optimization)
-        legal_moves.sort(key=lambda move: board.is_capture(move), reverse=True)
-        
-        for move in legal_moves:
-            # Make the move
-            captured_piece = board.piece_at(move.to_square)
-            board.push(move)
-            
-            # Calculate score after move
-            if captured_piece:
-                capture_value = self.piece_values[captured_piece.piece_type]
-                if board.turn == chess.BLACK:  # White captured
-                    self.white_points += capture_value
-                else:  # Black captured
-                    self.black_points += capture_value
-            
-            # Check for checkmate (immediate win)
-            if board.is_checkmate():
-                score = 10000 if board.turn == chess.BLACK else -10000
-            # If last move and supported piece was captured, need to consider opponent's extra move
-            elif is_last_move and captured_piece and self.is_piece_supported(board, move):
-                # Opponent gets extra move, so evaluate after that move
-                extra_move = self.calculate_best_move(board, depth-1, False)
-                if extra_move:
-                    # Opponent will make their best move, so use that evaluation
-                    score = self.evaluate_position(board)
-                else:
-                    score = self.evaluate_position(board)
-            elif depth > 1:
-                # Regular minimax recursion
-                next_move = self.calculate_best_move(board, depth-1, False)
-                score = self.evaluate_position(board)
-            else:
-                score = self.evaluate_position(board)
-            
-            # Undo the move and point calculation
-            if captured_piece:
-                capture_value = self.piece_values[captured_piece.piece_type]
-                if board.turn == chess.WHITE:  # Black captured
-                    self.black_points -= capture_value
-                else:  # White captured
-                    self.white_points -= capture_value
-            board.pop()
-            
-            # Update best move
-            if board.turn == chess.WHITE:
-                if score > best_score:
-                    best_score = score
-                    best_move = move
-            else:
-                if score < best_score:
-                    best_score = score
-                    best_move = move
-        
-        return best_move
+from points_app import EngineSearchMixin
+from points_engine import PointsChessEngine
+
+# Map piece dropdown text to chess.Piece
+_PIECE_MAP = {
+    "White Pawn": chess.Piece(chess.PAWN, chess.WHITE),
+    "White Knight": chess.Piece(chess.KNIGHT, chess.WHITE),
+    "White Bishop": chess.Piece(chess.BISHOP, chess.WHITE),
+    "White Rook": chess.Piece(chess.ROOK, chess.WHITE),
+    "White Queen": chess.Piece(chess.QUEEN, chess.WHITE),
+    "White King": chess.Piece(chess.KING, chess.WHITE),
+    "Black Pawn": chess.Piece(chess.PAWN, chess.BLACK),
+    "Black Knight": chess.Piece(chess.KNIGHT, chess.BLACK),
+    "Black Bishop": chess.Piece(chess.BISHOP, chess.BLACK),
+    "Black Rook": chess.Piece(chess.ROOK, chess.BLACK),
+    "Black Queen": chess.Piece(chess.QUEEN, chess.BLACK),
+    "Black King": chess.Piece(chess.KING, chess.BLACK),
+    "Empty": None
+}
+
+# Piece dropdown entries, in the order above
+_PIECE_LABELS = tuple(_PIECE_MAP)
 
 class ChessBoardWidget(QWidget):
+    # Number of rendered board SVGs to keep
+    SVG_CACHE_SIZE = 32
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.board = chess.Board(chess.STARTING_FEN)
@@ -152,13 +53,31 @@ class ChessBoardWidget(QWidget):
         self.selected_square = None
         self.svg_widget.mousePressEvent = self.mouse_press_event
         
+        # Rendered SVGs by piece placement, least recently used first
+        self._svg_cache = OrderedDict()
+        self._last_fen = None
+        
         # Update the board display
         self.update_board()
         
     def update_board(self):
         """Update the board display"""
-        svg_data = chess.svg.board(self.board, size=600).encode('UTF-8')
+        # The SVG only shows the pieces, so it only changes with their placement
+        fen = self.board.board_fen()
+        if fen == self._last_fen:
+            return
+        
+        svg_data = self._svg_cache.get(fen)
+        if svg_data is None:
+            svg_data = chess.svg.board(self.board, size=600).encode('UTF-8')
+            self._svg_cache[fen] = svg_data
+            if len(self._svg_cache) > self.SVG_CACHE_SIZE:
+                self._svg_cache.popitem(last=False)
+        else:
+            self._svg_cache.move_to_end(fen)
+        
         self.svg_widget.load(svg_data)
+        self._last_fen = fen
         
     def mouse_press_event(self, event):
         """Handle mouse press events for piece movement"""
@@ -173,6 +92,9 @@ class ChessBoardWidget(QWidget):
         # Calculate square index (0-63)
         square = chess.square(x, y)
         
+        # Only a change of position needs a redraw; the selection isn't drawn
+        dirty = False
+        
         # If a square is already selected, try to make a move
         if self.selected_square is not None:
             # Create a move from the selected square to the clicked square
@@ -181,14 +103,15 @@ class ChessBoardWidget(QWidget):
             # Check if the move is legal
             if move in self.board.legal_moves:
                 self.board.push(move)
-                self.update_board()
+                dirty = True
             self.selected_square = None
-            self.update_board()
         else:
             # If the clicked square has a piece, select it
             if self.board.piece_at(square) is not None:
                 self.selected_square = square
-                self.update_board()
+                
+        if dirty:
+            self.update_board()
 
 class PieceSetupPanel(QWidget):
     def __init__(self, chess_board, parent=None):
@@ -201,17 +124,13 @@ class PieceSetupPanel(QWidget):
         # Piece selection dropdown
         piece_layout = QHBoxLayout()
         self.piece_dropdown = QComboBox()
-        pieces = ["White Pawn", "White Knight", "White Bishop", "White Rook", 
-                 "White Queen", "White King", "Black Pawn", "Black Knight", 
-                 "Black Bishop", "Black Rook", "Black Queen", "Black King", "Empty"]
-        self.piece_dropdown.addItems(pieces)
+        self.piece_dropdown.addItems(_PIECE_LABELS)
         piece_layout.addWidget(QLabel("Piece:"))
         piece_layout.addWidget(self.piece_dropdown)
         
         # Square selection dropdown
         self.square_dropdown = QComboBox()
-        squares = [chess.square_name(square) for square in range(64)]
-        self.square_dropdown.addItems(squares)
+        self.square_dropdown.addItems(chess.SQUARE_NAMES)
         piece_layout.addWidget(QLabel("Square:"))
         piece_layout.addWidget(self.square_dropdown)
         
@@ -235,28 +154,11 @@ class PieceSetupPanel(QWidget):
         piece_text = self.piece_dropdown.currentText()
         square_text = self.square_dropdown.currentText()
         
-        # Map piece text to chess.Piece
-        piece_map = {
-            "White Pawn": chess.Piece(chess.PAWN, chess.WHITE),
-            "White Knight": chess.Piece(chess.KNIGHT, chess.WHITE),
-            "White Bishop": chess.Piece(chess.BISHOP, chess.WHITE),
-            "White Rook": chess.Piece(chess.ROOK, chess.WHITE),
-            "White Queen": chess.Piece(chess.QUEEN, chess.WHITE),
-            "White King": chess.Piece(chess.KING, chess.WHITE),
-            "Black Pawn": chess.Piece(chess.PAWN, chess.BLACK),
-            "Black Knight": chess.Piece(chess.KNIGHT, chess.BLACK),
-            "Black Bishop": chess.Piece(chess.BISHOP, chess.BLACK),
-            "Black Rook": chess.Piece(chess.ROOK, chess.BLACK),
-            "Black Queen": chess.Piece(chess.QUEEN, chess.BLACK),
-            "Black King": chess.Piece(chess.KING, chess.BLACK),
-            "Empty": None
-        }
-        
         # Get the square index
         square = chess.parse_square(square_text)
         
         # Place the piece on the board
-        self.chess_board.board.set_piece_at(square, piece_map[piece_text])
+        self.chess_board.board.set_piece_at(square, _PIECE_MAP[piece_text])
         self.chess_board.update_board()
         
     def clear_board(self):
@@ -264,7 +166,7 @@ class PieceSetupPanel(QWidget):
         self.chess_board.board.clear()
         self.chess_board.update_board()
 
-class PointsChessApp(QMainWindow):
+class PointsChessApp(EngineSearchMixin, QMainWindow):
     def __init__(self):
         super().__init__()
         
@@ -362,58 +264,6 @@ class PointsChessApp(QMainWindow):
             self.engine.reset()
             self.update_status()
             
-    def calculate_best_move(self):
-        """Calculate and show the best move"""
-        if not self.game_active:
-            return
-            
-        # Update status
-        self.engine_status.setText("Engine: Calculating...")
-        QApplication.processEvents()
-        
-        # Determine if this is the last move
-        is_last_move = self.engine.moves_made >= 5
-        
-        # Calculate best move
-        start_time = time.time()
-        move = self.engine.calculate_best_move(self.chess_board.board, depth=4, is_last_move=is_last_move)
-        end_time = time.time()
-        
-        if move:
-            # Get the piece type at the destination square (for capture calculation)
-            captured_piece = self.chess_board.board.piece_at(move.to_square)
-            
-            # Make the move
-            self.chess_board.board.push(move)
-            
-            # Update points if a capture was made
-            if captured_piece:
-                capture_value = self.engine.piece_values[captured_piece.piece_type]
-                if self.chess_board.board.turn == chess.BLACK:  # White captured
-                    self.engine.white_points += capture_value
-                else:  # Black captured
-                    self.engine.black_points += capture_value
-                    
-                # Check for extra move on last turn
-                if is_last_move and self.engine.is_piece_supported(self.chess_board.board, move):
-                    self.engine.extra_move_granted = True
-            
-            # Update moves counter
-            self.engine.moves_made += 1
-            
-            # Update display
-            self.chess_board.update_board()
-            self.update_status()
-            
-            # Show calculation time
-            calc_time = end_time - start_time
-            self.engine_status.setText(f"Engine: Move found in {calc_time:.2f} seconds")
-            
-            # Check for game end
-            self.check_game_end()
-        else:
-            self.engine_status.setText("Engine: No legal moves found")
-            
     def skip_turn(self):
         """Skip the current player's turn"""
         if not self.game_active:
@@ -0,0 +1,153 @@
+"""Main window parts shared by the Points Chess apps
+
+Both apps run the engine search off the GUI thread with SearchWorker and
+get the slots that start it and apply the move it finds from
+EngineSearchMixin.
+"""
+import time
+
+import chess
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Moves in a game, not counting an extra move earned on the last one
+GAME_MOVES = 6
+
+class SearchSignals(QObject):
+    # Emitted with the best move (or None) and the search time in seconds
+    finished = pyqtSignal(object, float)
+    # Emitted after finished if the search raised, with the error message
+    failed = pyqtSignal(str)
+
+class SearchWorker(QRunnable):
+    """Run an engine search off the GUI thread"""
+    def __init__(self, engine, board, depth, plies_left, pool=None, time_limit=None):
+        super().__init__()
+        self.engine = engine
+        self.board = board
+        self.depth = depth
+        self.plies_left = plies_left
+        self.pool = pool
+        self.time_limit = time_limit
+        self.signals = SearchSignals()
+
+    def run(self):
+        start_time = time.time()
+        move = None
+        error = None
+        try:
+            move = self.engine.calculate_best_move(self.board, depth=self.depth, plies_left=self.plies_left,
+                                                   pool=self.pool, time_limit=self.time_limit)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        finally:
+            # Always finish, so that the app re-enables its controls
+            self.signals.finished.emit(move, time.time() - start_time)
+        if error is not None:
+            self.signals.failed.emit(error)
+
+class EngineSearchMixin:
+    """Engine search slots for an app's main window
+
+    The window provides engine, chess_board, game_active, the
+    engine_status label, best_move_button, skip_move_button, and the
+    update_status and check_game_end methods.
+    """
+    # Deepest search to try, and the time it may take in seconds
+    SEARCH_DEPTH = 4
+    SEARCH_TIME_LIMIT = None
+
+    # Worker processes that share the root search, if any
+    search_pool = None
+
+    # Background search state
+    search_worker = None
+    search_fen = None
+    search_is_last_move = False
+
+    def calculate_best_move(self):
+        """Start calculating the best move in the background"""
+        if not self.game_active or self.search_worker is not None:
+            return
+
+        # Update status
+        self.engine_status.setText("Engine: Calculating...")
+        self.best_move_button.setEnabled(False)
+        self.skip_move_button.setEnabled(False)
+
+        # Determine if this is the last move
+        self.search_is_last_move = self.engine.moves_made >= GAME_MOVES - 1
+
+        # Moves left in the game, this one included
+        plies_left = GAME_MOVES - self.engine.moves_made
+        if self.engine.extra_move_granted:
+            plies_left += 1
+
+        # Search a copy so the displayed board can't change under the engine
+        board = self.chess_board.board.copy(stack=False)
+        self.search_fen = board.fen()
+        self.search_worker = SearchWorker(self.engine, board, self.SEARCH_DEPTH, plies_left,
+                                          self.search_pool, self.SEARCH_TIME_LIMIT)
+        self.search_worker.signals.finished.connect(self.on_move_ready)
+        self.search_worker.signals.failed.connect(self.on_search_failed)
+        QThreadPool.globalInstance().start(self.search_worker)
+
+    def on_move_ready(self, move, calc_time):
+        """Apply the move found by the background search"""
+        self.search_worker = None
+        self.best_move_button.setEnabled(True)
+        self.skip_move_button.setEnabled(True)
+
+        # Ignore results for a game or position that is no longer current
+        if not self.game_active or self.chess_board.board.fen() != self.search_fen:
+            self.engine_status.setText("Engine: Ready")
+            return
+
+        is_last_move = self.search_is_last_move
+
+        if move:
+            # Get the captured piece and the capturing side before the move is made
+            captured_piece = self.chess_board.board.piece_at(move.to_square)
+            mover = self.chess_board.board.turn
+
+            # Capturing a supported piece on the last move grants an extra move
+            grants_extra_move = (is_last_move and captured_piece is not None
+                                 and self.engine.is_piece_supported(self.chess_board.board, move))
+
+            # Make the move
+            self.chess_board.board.push(move)
+
+            # Update points if a capture was made
+            if captured_piece:
+                capture_value = self.engine.piece_values[captured_piece.piece_type]
+                if mover == chess.WHITE:
+                    self.engine.white_points += capture_value
+                else:
+                    self.engine.black_points += capture_value
+
+                # Check for extra move on last turn
+                if grants_extra_move:
+                    self.engine.extra_move_granted = True
+
+            # Update moves counter
+            self.engine.moves_made += 1
+
+            # Update display
+            self.chess_board.update_board()
+            self.update_status()
+
+            # Show calculation time
+            self.engine_status.setText(f"Engine: Move found in {calc_time:.2f} seconds")
+
+            # Check for game end
+            self.check_game_end()
+        else:
+            self.engine_status.setText("Engine: No legal moves found")
+
+    def on_search_failed(self, message):
+        """Show why the background search failed"""
+        self.engine_status.setText(f"Engine: Search failed ({message})")
+
+    def stop_search(self):
+        """Stop the background search and wait for it to return"""
+        self.engine.stop()
+        QThreadPool.globalInstance().waitForDone()
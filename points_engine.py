@@ -0,0 +1,527 @@
+"""Search engine for Points Chess
+
+Kept free of Qt imports so it can be used headless, and fully annotated
+so it can be compiled with mypyc for a faster search:
+
+    pip install mypy
+    mypyc points_engine.py
+
+The compiled extension is picked up in place of this file by the same
+import statement.
+"""
+import multiprocessing
+import time
+from array import array
+from multiprocessing.pool import Pool
+from typing import Iterator, List, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+# Point values indexed by piece type (chess.PAWN == 1 ... chess.KING == 6).
+# King has no capture value.
+PIECE_VALUES: Tuple[int, ...] = (0, 1, 3, 3, 5, 9, 0)
+
+# Score for the side to move being checkmated
+MATE_SCORE = 10000
+
+# Integer sentinels beyond any real score. The root window is
+# (-MATE_SCORE, MATE_SCORE), so that finding a mate causes a cutoff.
+INF = 10**9
+NINF = -INF
+
+# Transposition table bound flags
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Number of transposition table slots, as a power of two
+TT_SIZE_BITS = 20
+
+# plies_left for a game that doesn't end within reach of the search
+NO_GAME_END = 0xFFFF
+
+# Seconds between checks for a stop request while waiting on pool workers
+POOL_POLL_SECONDS = 0.1
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its time limit has run out or it was stopped"""
+
+class PointsChessEngine:
+    def __init__(self) -> None:
+        # Point values for each piece type
+        self.piece_values: Tuple[int, ...] = PIECE_VALUES
+
+        # Track points for each player
+        self.white_points: int = 0
+        self.black_points: int = 0
+
+        # Track moves made
+        self.moves_made: int = 0
+
+        # Track if extra move is granted
+        self.extra_move_granted: bool = False
+
+        # Transposition table, see _clear_tt
+        self._clear_tt()
+
+        # time.time() at which the running search must stop, if limited
+        self._deadline: Optional[float] = None
+
+        # Set by stop() from another thread to abandon searching
+        self._stopped: bool = False
+
+    def reset(self) -> None:
+        """Reset the engine state for a new game"""
+        self.white_points = 0
+        self.black_points = 0
+        self.moves_made = 0
+        self.extra_move_granted = False
+        self._stopped = False
+        self._clear_tt()
+
+    def stop(self) -> None:
+        """Abandon the running search, and any later one until reset
+
+        Safe to call from another thread. The search returns the best move
+        found so far, or None if it hadn't finished depth 1.
+        """
+        self._stopped = True
+
+    def _clear_tt(self) -> None:
+        """Allocate an empty transposition table
+
+        The table has a fixed number of slots, indexed by the low bits of
+        a position's Zobrist hash and kept in parallel arrays: the full
+        hash, moves left in the game, search depth, score, bound flag and
+        best move (see _encode_move). A slot is overwritten by every store
+        that maps to it. Scores exclude the points captured on the way to
+        the position, and only apply with the same number of moves left.
+        """
+        size = 1 << TT_SIZE_BITS
+        self._tt_mask = size - 1
+        self._tt_keys = array('Q', [0]) * size
+        self._tt_plies = array('H', [0]) * size
+        self._tt_depths = array('b', [0]) * size
+        self._tt_scores = array('i', [0]) * size
+        self._tt_flags = array('b', [0]) * size
+        self._tt_moves = array('H', [0]) * size
+
+    @staticmethod
+    def _encode_move(move: Optional[chess.Move]) -> int:
+        """Pack a move into 16 bits for the transposition table, 0 for None"""
+        if move is None:
+            return 0
+        return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+    @staticmethod
+    def _decode_move(code: int) -> Optional[chess.Move]:
+        """Unpack a move packed by _encode_move"""
+        if code == 0:
+            return None
+        return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+    def is_piece_supported(self, board: chess.Board, move: chess.Move) -> bool:
+        """Check if the piece captured by move is supported by any other piece
+
+        Called before the move is made. The capturing piece is treated as
+        already gone from its square, so pieces behind it count as support.
+        """
+        # The captured piece belongs to the side not to move
+        occupied = board.occupied & ~chess.BB_SQUARES[move.from_square]
+        return bool(board.attackers_mask(not board.turn, move.to_square, occupied))
+
+    def calculate_best_move(self, board: chess.Board, depth: int = 3, plies_left: Optional[int] = None,
+                            pool: Optional[Pool] = None, time_limit: Optional[float] = None) -> Optional[chess.Move]:
+        """Find the best move considering points chess rules
+
+        Searches with iterative deepening up to depth plies, trying the
+        previous iteration's best move first, and stops early once a forced
+        mate is found. plies_left is the number of moves left in the game,
+        this one included, or None if it doesn't end; the search goes no
+        deeper than that, except for the extra move that a capture on the
+        last move can earn. With a time_limit (seconds), an iteration still
+        running when it expires is abandoned and the best move of the
+        deepest finished one is returned; depth 1 always finishes. If a
+        multiprocessing pool is given, the root moves are searched in
+        parallel by its worker processes. The given board is never modified.
+        """
+        # Search a clone without move history; the caller's board and its
+        # cached state stay untouched even if the search is interrupted
+        search_board = board.copy(stack=False)
+
+        game_plies = NO_GAME_END if plies_left is None else min(plies_left, NO_GAME_END)
+
+        # Deeper iterations than the moves left would only repeat the last
+        # one; the extra move below the last move is searched regardless
+        max_depth = min(depth, game_plies)
+
+        start_time = time.time()
+        best_move = None
+        try:
+            for current_depth in range(1, max_depth + 1):
+                if self._stopped:
+                    break
+                if pool is not None:
+                    score, best_move = self._split_root(search_board, current_depth, game_plies, pool,
+                                                        best_move)
+                else:
+                    score, best_move = self._negamax(search_board, current_depth, -MATE_SCORE, MATE_SCORE,
+                                                     0, game_plies, best_move)
+                # Nothing beats a forced mate, so there is no need to look deeper
+                if score >= MATE_SCORE:
+                    break
+                if time_limit is not None:
+                    if time.time() - start_time >= time_limit:
+                        break
+                    self._deadline = start_time + time_limit
+        except SearchTimeout:
+            pass
+        finally:
+            self._deadline = None
+        return best_move
+
+    def _ordered_moves(self, board: chess.Board,
+                       first_move: Optional[chess.Move] = None) -> List[Tuple[int, chess.Move]]:
+        """Return (captured_type, move) pairs for all legal moves
+
+        captured_type is the type of the piece the move captures, or 0 for
+        a quiet move. Captures come first, in MVV-LVA order, then quiet
+        moves. first_move, typically the best move from the
+        transposition table, is tried before everything else.
+        """
+        annotated = self._ordered_captures(board)
+        annotated.extend((0, move) for move in self._quiet_moves(board))
+        return self._move_to_front(annotated, first_move)
+
+    def _ordered_captures(self, board: chess.Board) -> List[Tuple[int, chess.Move]]:
+        """Return (captured_type, move) pairs for captures in MVV-LVA order"""
+        # Generate moves onto enemy pieces directly; en passant lands on an
+        # empty square and, like in the point counting, scores nothing
+        enemy_mask = board.occupied_co[not board.turn]
+        bb_squares = chess.BB_SQUARES
+        captures: List[Tuple[int, chess.Move]] = []
+        for move in board.generate_legal_moves(chess.BB_ALL, enemy_mask):
+            # Find the victim's type from the piece bitboards, without
+            # building a chess.Piece. A hand-set position can leave the
+            # enemy king en prise; taking it scores nothing.
+            to_bb = bb_squares[move.to_square]
+            if board.pawns & to_bb:
+                captured_type = chess.PAWN
+            elif board.knights & to_bb:
+                captured_type = chess.KNIGHT
+            elif board.bishops & to_bb:
+                captured_type = chess.BISHOP
+            elif board.rooks & to_bb:
+                captured_type = chess.ROOK
+            elif board.queens & to_bb:
+                captured_type = chess.QUEEN
+            else:
+                captured_type = chess.KING
+            captures.append((captured_type, move))
+
+        # Most valuable victim first, least valuable attacker first among
+        # equal victims; piece types rank the attackers with the king last
+        def mvv_lva(entry: Tuple[int, chess.Move]) -> int:
+            attacker_type = board.piece_type_at(entry[1].from_square) or 0
+            return PIECE_VALUES[entry[0]] * 100 + (10 - attacker_type)
+
+        captures.sort(key=mvv_lva, reverse=True)
+        return captures
+
+    def _quiet_moves(self, board: chess.Board) -> Iterator[chess.Move]:
+        """Generate the legal moves that capture nothing"""
+        return board.generate_legal_moves(chess.BB_ALL, ~board.occupied_co[not board.turn] & chess.BB_ALL)
+
+    def _move_to_front(self, annotated: List[Tuple[int, chess.Move]],
+                       first_move: Optional[chess.Move]) -> List[Tuple[int, chess.Move]]:
+        """Move the entry for first_move, if present, to the front of the list"""
+        if first_move is not None:
+            for index, (_, move) in enumerate(annotated):
+                if move == first_move:
+                    annotated.insert(0, annotated.pop(index))
+                    break
+        return annotated
+
+    def _child_depth(self, board: chess.Board, move: chess.Move, captured_type: int,
+                     depth: int, is_last_move: bool) -> int:
+        """Depth to search below a move that is about to be made"""
+        if is_last_move:
+            # The game ends after the last move, unless a supported piece
+            # was captured and the opponent gets one extra move
+            if captured_type and self.is_piece_supported(board, move):
+                return 1
+            return 0
+        return depth - 1
+
+    def _child_key(self, board: chess.Board, move: chess.Move, captured_type: int,
+                   key: int) -> Optional[int]:
+        """Zobrist hash of the position after a move, updated from key
+
+        Called before the move is made. Only piece placement and the turn
+        are updated, so None is returned for moves that promote, change
+        castling rights or the en passant square; the position after them
+        has to be hashed in full.
+        """
+        from_square = move.from_square
+        to_square = move.to_square
+        mover_type = board.piece_type_at(from_square)
+        castling_rights = board.castling_rights
+        if (mover_type is None or move.promotion or board.ep_square is not None
+                or castling_rights & (chess.BB_SQUARES[from_square] | chess.BB_SQUARES[to_square])):
+            return None
+        turn = board.turn
+        if mover_type == chess.KING and castling_rights & (chess.BB_RANK_1 if turn else chess.BB_RANK_8):
+            return None
+        if mover_type == chess.PAWN and abs(to_square - from_square) == 16:
+            return None
+
+        # Polyglot keys are indexed by 64 * piece index + square, where the
+        # piece index is (type - 1) * 2, plus 1 for white
+        randoms = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+        mover_base = 64 * ((mover_type - 1) * 2 + turn)
+        key ^= randoms[mover_base + from_square] ^ randoms[mover_base + to_square] ^ randoms[780]
+        if captured_type:
+            key ^= randoms[64 * ((captured_type - 1) * 2 + (not turn)) + to_square]
+        return key
+
+    def _split_root(self, board: chess.Board, depth: int, plies_left: int, pool: Pool,
+                    first_move: Optional[chess.Move] = None) -> Tuple[int, Optional[chess.Move]]:
+        """Search the root moves in worker processes, returns (score, move)
+
+        The first move in the ordering, first_move if given, is searched
+        here with a full window. Its score is then the lower bound for the
+        remaining moves, which are searched in parallel and only need to
+        show whether they beat it.
+        """
+        color_sign = 1 if board.turn == chess.WHITE else -1
+        is_last_move = plies_left == 1
+        child_plies = plies_left if plies_left == NO_GAME_END else plies_left - 1
+        annotated = self._ordered_moves(board, first_move)
+        if not annotated:
+            return (-MATE_SCORE if board.is_check() else 0), None
+
+        captured_type, best_move = annotated[0]
+        child_delta = color_sign * PIECE_VALUES[captured_type]
+        child_depth = self._child_depth(board, best_move, captured_type, depth, is_last_move)
+        board.push(best_move)
+        try:
+            score, _ = self._negamax(board, child_depth, -MATE_SCORE, MATE_SCORE, child_delta, child_plies)
+        finally:
+            board.pop()
+        best_score = -score
+        if best_score >= MATE_SCORE:
+            return best_score, best_move
+
+        fen = board.fen()
+        tasks = []
+        for captured_type, move in annotated[1:]:
+            child_delta = color_sign * PIECE_VALUES[captured_type]
+            child_depth = self._child_depth(board, move, captured_type, depth, is_last_move)
+            tasks.append((fen, move, child_depth, child_delta, child_plies, best_score, self._deadline))
+
+        # Ties go to the move that comes first in the move ordering
+        order = {task[1]: index for index, task in enumerate(tasks)}
+        best_key = (best_score, 1)
+        results = pool.imap_unordered(_eval_root_move, tasks)
+        while True:
+            # Wait with a timeout, so that a stop request is seen even if
+            # the workers were terminated and no result will ever arrive
+            try:
+                move, move_score = results.next(POOL_POLL_SECONDS)
+            except multiprocessing.TimeoutError:
+                if self._stopped:
+                    raise SearchTimeout()
+                continue
+            except StopIteration:
+                break
+            if move_score is None or self._stopped:
+                raise SearchTimeout()
+            key = (move_score, -order[move])
+            if key > best_key:
+                best_key = key
+                best_score = move_score
+                best_move = move
+
+        return best_score, best_move
+
+    def _negamax(self, board: chess.Board, depth: int, alpha: int, beta: int, score_delta: int,
+                 plies_left: int = NO_GAME_END, first_move: Optional[chess.Move] = None,
+                 key: Optional[int] = None) -> Tuple[int, Optional[chess.Move]]:
+        """Negamax search with alpha-beta pruning, returns (score, move)
+
+        score_delta is the white-minus-black value of the pieces captured
+        since the root. Returned scores are from the point of view of the
+        side to move. plies_left is the number of moves left in the game,
+        or NO_GAME_END; at 0 the game is over, though an extra move earned
+        on the last one is still searched. first_move is tried first when
+        the transposition table has no move for the position. Leaves are
+        resolved with _quiesce, unless the game is over there, or has one
+        move left, which is searched in full. key is the position's Zobrist
+        hash, if the caller already knows it.
+        """
+        color_sign = 1 if board.turn == chess.WHITE else -1
+
+        if depth <= 0:
+            if plies_left <= 0:
+                if board.is_checkmate():
+                    return -MATE_SCORE, None
+                return color_sign * score_delta, None
+            if plies_left > 1:
+                return self._quiesce(board, alpha, beta, score_delta, plies_left), None
+            # Captures on the last move follow their own rules
+            depth = 1
+
+        if self._stopped or (self._deadline is not None and time.time() > self._deadline):
+            raise SearchTimeout()
+
+        is_last_move = plies_left == 1
+        child_plies = plies_left if plies_left == NO_GAME_END else plies_left - 1
+
+        # Positions searched on the last move follow different rules,
+        # so they are kept out of the transposition table
+        use_tt = plies_left > 1
+        tt_move = None
+        alpha_orig = alpha
+        # Captured points already counted at this node, from its side's view
+        node_delta = color_sign * score_delta
+        node_key = 0
+        if use_tt:
+            node_key = key if key is not None else chess.polyglot.zobrist_hash(board)
+            slot = node_key & self._tt_mask
+            if self._tt_keys[slot] == node_key and self._tt_plies[slot] == plies_left:
+                tt_move = self._decode_move(self._tt_moves[slot])
+                if self._tt_depths[slot] >= depth:
+                    entry_score = self._tt_scores[slot]
+                    entry_flag = self._tt_flags[slot]
+                    if abs(entry_score) < MATE_SCORE:
+                        entry_score += node_delta
+                    if entry_flag == TT_EXACT:
+                        return entry_score, tt_move
+                    if entry_flag == TT_LOWER:
+                        alpha = max(alpha, entry_score)
+                    else:
+                        beta = min(beta, entry_score)
+                    if alpha >= beta:
+                        return entry_score, tt_move
+
+        best_score = NINF
+        best_move = None
+        piece_values = PIECE_VALUES
+
+        for captured_type, move in self._ordered_moves(board, tt_move or first_move):
+            # Score the capture before making the move
+            child_delta = score_delta + color_sign * piece_values[captured_type]
+
+            child_depth = self._child_depth(board, move, captured_type, depth, is_last_move)
+            child_key = None
+            if use_tt and child_depth > 0 and child_plies > 1:
+                child_key = self._child_key(board, move, captured_type, node_key)
+            board.push(move)
+
+            score, _ = self._negamax(board, child_depth, -beta, -alpha, child_delta, child_plies,
+                                     key=child_key)
+            score = -score
+
+            board.pop()
+
+            # Update best move
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_move is None:
+            # No legal moves: checkmate or stalemate
+            return (-MATE_SCORE if board.is_check() else node_delta), None
+
+        if use_tt:
+            if best_score <= alpha_orig:
+                flag = TT_UPPER
+            elif best_score >= beta:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            stored_score = best_score
+            if abs(stored_score) < MATE_SCORE:
+                stored_score -= node_delta
+            self._tt_keys[slot] = node_key
+            self._tt_plies[slot] = plies_left
+            self._tt_depths[slot] = depth
+            self._tt_scores[slot] = stored_score
+            self._tt_flags[slot] = flag
+            self._tt_moves[slot] = self._encode_move(best_move)
+
+        return best_score, best_move
+
+    def _quiesce(self, board: chess.Board, alpha: int, beta: int, score_delta: int, plies_left: int) -> int:
+        """Search captures only until the position is quiet, returns the score
+
+        The side to move may stand pat on the points captured so far
+        instead of capturing. In check it has to move, so all evasions are
+        searched and checkmate is detected. The captures stop at the end of
+        the game, where _negamax takes over. Arguments and score are as for
+        _negamax.
+        """
+        if plies_left <= 1:
+            return self._negamax(board, 0, alpha, beta, score_delta, plies_left)[0]
+
+        color_sign = 1 if board.turn == chess.WHITE else -1
+        child_plies = plies_left if plies_left == NO_GAME_END else plies_left - 1
+        in_check = board.is_check()
+
+        best_score = NINF
+        if not in_check:
+            best_score = color_sign * score_delta
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            moves = self._ordered_captures(board)
+        else:
+            moves = self._ordered_moves(board)
+            if not moves:
+                return -MATE_SCORE
+
+        piece_values = PIECE_VALUES
+        for captured_type, move in moves:
+            child_delta = score_delta + color_sign * piece_values[captured_type]
+
+            board.push(move)
+            score = -self._quiesce(board, -beta, -alpha, child_delta, child_plies)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        return best_score
+
+# Engine used by multiprocessing workers, created on first use in each process
+_worker_engine: Optional[PointsChessEngine] = None
+
+def _eval_root_move(task: Tuple[str, chess.Move, int, int, int, int, Optional[float]]
+                    ) -> Tuple[chess.Move, Optional[int]]:
+    """Search one root move in a worker process
+
+    Returns (move, score), with a score of None if the deadline passed.
+    A score at or below the given alpha is only an upper bound.
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = PointsChessEngine()
+
+    fen, move, depth, score_delta, plies_left, alpha, deadline = task
+    board = chess.Board(fen)
+    board.push(move)
+    _worker_engine._deadline = deadline
+    try:
+        score, _ = _worker_engine._negamax(board, depth, -MATE_SCORE, -alpha, score_delta, plies_left)
+    except SearchTimeout:
+        return move, None
+    finally:
+        _worker_engine._deadline = None
+    return move, -score